@@ -1,27 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import os
+import re
 import subprocess
+import sys
+
+
+IMAGE_PATH_RE = re.compile(rb"(!\[[^\]\n]*\]\()\.\./public")
 
 
 def convert_notebook(path):
     name = Path(path).stem
-    cwd = Path.cwd()
     file_dir = Path("../public/images") / f"{name}_files"
-    output = cwd / "posts" / f"{name}.md"
 
-    subprocess.run(["jupyter", "nbconvert", "--to", "markdown", "--NbConvertApp.output_files_dir", file_dir, path])
+    return subprocess.run(["jupyter", "nbconvert", "--to", "markdown", "--NbConvertApp.output_files_dir", file_dir, path]).returncode
+
+
+def fix_image_paths(path):
+    name = Path(path).stem
+    cwd = Path.cwd()
+    output = cwd / "posts" / f"{name}.md"
+    tmp = output.with_suffix(".md.tmp")
 
     # NextJS wants paths from the public root, so manually replace the markdown paths
-    with open(output, "r") as f:
-        lines = f.readlines()
-        for i, line in enumerate(lines):
-            if line.startswith("!["):
-                lines[i] = line.replace("../public", "")
-    
-    with open(output, "w") as f:
-        f.writelines(lines)
-        
+    try:
+        tmp.write_bytes(IMAGE_PATH_RE.sub(rb"\1", output.read_bytes()))
+        os.replace(tmp, output)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
 
 if __name__ == "__main__":
-    notebooks = Path("./posts").glob("*.ipynb")
+    notebooks = list(Path("./posts").glob("*.ipynb"))
+
+    # Each nbconvert call pays interpreter startup, so overlap them, capped to avoid
+    # running too many memory-heavy notebooks at once
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        return_codes = list(pool.map(convert_notebook, notebooks))
+
+    failed = [notebook for notebook, code in zip(notebooks, return_codes) if code != 0]
     for notebook in notebooks:
-        convert_notebook(notebook)
\ No newline at end of file
+        if notebook not in failed:
+            fix_image_paths(notebook)
+
+    if failed:
+        sys.exit("Failed to convert: " + ", ".join(str(notebook) for notebook in failed))
@@ -0,0 +1,21 @@
+from scripts.convert_notebooks import fix_image_paths
+
+
+def test_fix_image_paths(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "posts").mkdir()
+    output = tmp_path / "posts" / "nb.md"
+    output.write_bytes(
+        b"![a](../public/b) ![c](../public/d)\r\n"
+        b"See ../public for details\r\n"
+        b"![e](../public/f.png)\n"
+    )
+
+    fix_image_paths("nb.ipynb")
+
+    assert output.read_bytes() == (
+        b"![a](/b) ![c](/d)\r\n"
+        b"See ../public for details\r\n"
+        b"![e](/f.png)\n"
+    )
+    assert not (tmp_path / "posts" / "nb.md.tmp").exists()